@@ -8,6 +8,7 @@ from typing import Iterator
 
 from .. import __version__
 from ._error import Error
+from ._extractors import clear_infer_cache, clear_markers_cache
 from ._func import Func
 from ._rules import FuncRule, ModuleRule, rules
 from ._stub import StubsManager
@@ -78,19 +79,24 @@ class Checker:
 
     def get_errors(self) -> Iterator[Error]:
         reported = set()
-        for func in self.get_funcs():
-            for rule in self._rules:
-                if not isinstance(rule, FuncRule):
-                    continue
-                for error in rule(func=func, stubs=self._stubs):
-                    hs = hash(error)
-                    if hs in reported:
-                        continue
-                    noqa = self._get_noqa(error.row)
-                    if f'{error.code:03d}'.startswith(noqa):
+        # the caches are cleared even if analysis fails or isn't finished
+        try:
+            for func in self.get_funcs():
+                for rule in self._rules:
+                    if not isinstance(rule, FuncRule):
                         continue
-                    reported.add(hs)
-                    yield error
+                    for error in rule(func=func, stubs=self._stubs):
+                        hs = hash(error)
+                        if hs in reported:
+                            continue
+                        noqa = self._get_noqa(error.row)
+                        if f'{error.code:03d}'.startswith(noqa):
+                            continue
+                        reported.add(hs)
+                        yield error
+        finally:
+            clear_markers_cache()
+            clear_infer_cache()
 
         for rule in self._rules:
             if not isinstance(rule, ModuleRule):
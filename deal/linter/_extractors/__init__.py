@@ -1,11 +1,11 @@
 from .asserts import get_asserts
-from .common import TOKENS, get_name
+from .common import TOKENS, clear_infer_cache, get_name
 from .contracts import get_contracts
 from .definitions import get_definitions
 from .examples import get_example
 from .exceptions import get_exceptions
 from .imports import get_imports
-from .markers import get_markers
+from .markers import clear_markers_cache, get_markers
 from .pre import get_pre
 from .result import uses_result
 from .returns import get_returns, has_returns
@@ -13,6 +13,8 @@ from .value import UNKNOWN, get_value
 
 
 __all__ = [
+    'clear_infer_cache',
+    'clear_markers_cache',
     'get_asserts',
     'get_contracts',
     'get_definitions',
@@ -56,11 +56,15 @@ class Token(NamedTuple):
 
 
 def traverse(body: list[ast.AST | astroid.NodeNG]) -> Iterator[ast.AST | astroid.NodeNG]:
+    if not body:
+        return
+    # all nodes in the body come from the same library, either ast or astroid
+    if isinstance(body[0], ast.AST):
+        walk = _traverse_ast
+    else:
+        walk = _traverse_astroid
     for expr in body:
-        if isinstance(expr, ast.AST):
-            yield from _traverse_ast(expr)
-        else:
-            yield from _traverse_astroid(expr)
+        yield from walk(expr)
 
 
 def _traverse_ast(node: ast.AST) -> Iterator[ast.AST]:
@@ -131,17 +135,50 @@ def get_full_name(
     return path, func_name
 
 
+def memoize(cache: dict, func: Callable[..., T], expr: ast.AST | astroid.NodeNG) -> T:
+    """Call `func` for the node, reusing the result stored in the `cache`.
+
+    Nodes are hashed by identity, so they are used as keys directly.
+    If `func` raises an exception, nothing is stored.
+    """
+    if expr in cache:
+        return cache[expr]
+    result = func(expr)
+    cache[expr] = result
+    return result
+
+
+# Inference results for nodes of the analyzed code. The same node is inferred
+# by different extractors and every time the function containing it is analyzed.
+# The cache keeps the nodes, and so their whole trees, alive.
+# Whoever runs extractors must call `clear_infer_cache` after each file,
+# as `Checker` and `generate_stub` do.
+_INFER_CACHE: dict[astroid.NodeNG, Tuple[astroid.NodeNG, ...]] = {}
+
+
+def clear_infer_cache() -> None:
+    """Drop the inference results cached for the analyzed file.
+    """
+    _INFER_CACHE.clear()
+
+
 def infer(expr: ast.AST | astroid.NodeNG) -> Tuple[astroid.NodeNG, ...]:
     if isinstance(expr, ast.AST):
         return tuple()
+    # Failures aren't cached: RecursionError depends on the stack depth,
+    # and the next attempt may be less deep.
     with suppress(astroid.InferenceError, RecursionError):
-        guesses = expr.infer()
-        if guesses is astroid.Uninferable:  # pragma: no cover
-            return tuple()
-        return tuple(g for g in guesses if repr(g) != 'Uninferable')
+        return memoize(_INFER_CACHE, _infer, expr)
     return tuple()
 
 
+def _infer(expr: astroid.NodeNG) -> Tuple[astroid.NodeNG, ...]:
+    guesses = expr.infer()
+    if guesses is astroid.Uninferable:  # pragma: no cover
+        return tuple()
+    return tuple(g for g in guesses if repr(g) != 'Uninferable')
+
+
 def get_stub(
     module_name: str | None,
     expr: astroid.FunctionDef,
@@ -204,14 +241,19 @@ class Extractor:
         return handler
 
     def __call__(self, body: list, **kwargs) -> Iterator[Token]:
+        handlers = self.handlers
         for expr in traverse(body=body):
-            for token in self._handle(expr=expr, **kwargs):
+            # exact type match, most of the nodes have no handler
+            handler = handlers.get(type(expr))
+            if handler is None:
+                continue
+            for token in self._handle(handler, expr=expr, **kwargs):
                 yield self._ensure_node_info(expr=expr, token=token)
 
-    def _handle(self, expr: ast.AST | astroid.NodeNG, **kwargs) -> Iterator[Token]:
-        handler = self.handlers.get(type(expr))
-        if handler is None:
-            return
+    @staticmethod
+    def _handle(
+        handler: Handler, expr: ast.AST | astroid.NodeNG, **kwargs,
+    ) -> Iterator[Token]:
         token = handler(expr=expr, **kwargs)
         if token is None:
             return
@@ -222,8 +264,12 @@ class Extractor:
 
     @staticmethod
     def _ensure_node_info(token: Token, expr: ast.AST | astroid.NodeNG) -> Token:
-        if token.line == DEFAULT_LINE:
-            token = token._replace(line=expr.lineno)
-        if token.col == DEFAULT_COL:
-            token = token._replace(col=expr.col_offset)
-        return token
+        line, col, value, marker = token
+        if line != DEFAULT_LINE and col != DEFAULT_COL:
+            return token
+        if line == DEFAULT_LINE:
+            line = expr.lineno
+        if col == DEFAULT_COL:
+            col = expr.col_offset
+        # positional construction, `_replace` goes through kwargs
+        return Token(line, col, value, marker)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import ast
-from typing import Iterator
+import sys
+from typing import Any, Callable, Iterator
 
 from .._contract import Category
 from .._stub import StubsManager
-from .common import TOKENS, Extractor, Token, get_full_name, get_name, get_stub, infer
+from .common import (
+    TOKENS, Extractor, Token, get_full_name, get_name, get_stub, infer, memoize,
+)
 from .contracts import get_contracts
 from .value import get_value
 
@@ -23,6 +26,31 @@ DEFINITELY_RANDOM_FUNCS = frozenset({
     'getrandbits',
     'shuffle',
 })
+# Methods of `random.Random` that produce random values.
+# The private `_randbelow*` methods are reached when diving into
+# public methods, like `choice` of `random.SystemRandom`.
+MAYBE_RANDOM_FUNCS = DEFINITELY_RANDOM_FUNCS | frozenset({
+    '_randbelow',
+    '_randbelow_with_getrandbits',
+    '_randbelow_without_getrandbits',
+    'betavariate',
+    'binomialvariate',
+    'choice',
+    'choices',
+    'expovariate',
+    'gammavariate',
+    'gauss',
+    'lognormvariate',
+    'normalvariate',
+    'paretovariate',
+    'random',
+    'sample',
+    'seed',
+    'triangular',
+    'uniform',
+    'vonmisesvariate',
+    'weibullvariate',
+})
 SYSCALLS = frozenset({
     # https://docs.python.org/3/library/os.html#process-management
     'os.abort',
@@ -51,7 +79,44 @@ SYSCALLS = frozenset({
     'subprocess.run',
     'subprocess.Popen',
 })
-SYSCALLS_PREFIXES = ('os.exec', 'os.spawn', 'os.popen')
+# prefixes of process management functions from the `os` module
+OS_SYSCALLS_PREFIXES = ('exec', 'spawn', 'popen')
+# Built-in functions that have no markers of their own. Calls to them
+# are not inferred, so shadowing them won't be detected. `print` is checked
+# separately, it has the `stdout` or `stderr` marker depending on arguments.
+NO_INFER_NAMES = frozenset({
+    'abs',
+    'all',
+    'any',
+    'bool',
+    'dict',
+    'enumerate',
+    'float',
+    'frozenset',
+    'getattr',
+    'hasattr',
+    'int',
+    'isinstance',
+    'issubclass',
+    'iter',
+    'len',
+    'list',
+    'max',
+    'min',
+    'range',
+    'repr',
+    'reversed',
+    'set',
+    'sorted',
+    'str',
+    'sum',
+    'super',
+    'tuple',
+    'type',
+    'zip',
+})
+# methods of `pathlib.Path` that can write into a file
+PATHLIB_WRITE_SUFFIXES = ('.write_text', '.write_bytes', '.open')
 TIMES = frozenset({
     'os.times',
     'datetime.now',
@@ -88,6 +153,41 @@ NETWORK_FUNCS = frozenset({
     'asyncio.streams.start_unix_server',
 })
 
+# Markers for calls that can be classified by the function name alone.
+# The value is a pair of the marker name and the token value.
+# The marker is None for functions that have no markers and don't need inference.
+_NAME_TO_MARKER: dict[str, tuple[str | None, str | None]] = {
+    'input': ('stdin', 'input'),
+    '__import__': ('import', None),
+}
+_NAME_TO_MARKER.update({name: (None, None) for name in NO_INFER_NAMES})
+_NAME_TO_MARKER.update({name: ('random', name) for name in DEFINITELY_RANDOM_FUNCS})
+_NAME_TO_MARKER.update({name: ('syscall', name) for name in SYSCALLS})
+_NAME_TO_MARKER.update({name: ('time', name) for name in TIMES})
+# functions from the `time` module imported directly: `from time import time`
+_NAME_TO_MARKER.update({
+    name[len('time.'):]: ('time', name[len('time.'):])
+    for name in TIMES if name.startswith('time.')
+})
+
+# Results of helpers for already visited nodes, keyed by the node.
+# The caches keep the nodes, and so their whole trees, alive.
+# Whoever runs `get_markers` must call `clear_markers_cache` after each file,
+# as `Checker` and `generate_stub` do.
+_OPEN_TO_WRITE_CACHE: dict[Any, bool] = {}
+_PATHLIB_WRITE_CACHE: dict[Any, bool] = {}
+_NAME_CACHE: dict[Any, str | None] = {}
+_FULL_NAME_CACHE: dict[Any, tuple[str, str]] = {}
+
+
+def clear_markers_cache() -> None:
+    """Drop the results cached for AST nodes of the analyzed file.
+    """
+    _OPEN_TO_WRITE_CACHE.clear()
+    _PATHLIB_WRITE_CACHE.clear()
+    _NAME_CACHE.clear()
+    _FULL_NAME_CACHE.clear()
+
 
 @get_markers.register(*TOKENS.GLOBAL)
 def handle_global(expr, **kwargs) -> Token | None:
@@ -121,51 +221,44 @@ def handle_astroid_import_from(expr: astroid.ImportFrom, **kwargs) -> Token | No
 
 @get_markers.register(*TOKENS.CALL)
 def handle_call(expr, dive: bool = True, stubs: StubsManager | None = None) -> Iterator[Token]:
-    name = get_name(expr.func)
+    name = _get_name(expr.func)
     if name is None:
         return
+    line = expr.lineno
+    col = expr.col_offset
+
+    hit = _NAME_TO_MARKER.get(name)
+    if hit is not None:
+        marker, value = hit
+        if marker is not None:
+            yield Token(marker=marker, value=value, line=line, col=col)
+        return
 
     # stdout, stderr, stdin
-    token = _check_print(expr=expr, name=name)
-    if token is not None:
-        yield token
-        return
-    if name.startswith('sys.stdout'):
-        yield Token(marker='stdout', value='sys.stdout.')
-        return
-    if name.startswith('sys.stderr'):
-        yield Token(marker='stderr', value='sys.stderr.')
-        return
-    if name.startswith('sys.stdin'):
-        yield Token(marker='stdin', value='sys.stdin.')
-        return
-    if name == 'input':
-        yield Token(marker='stdin', value='input')
+    if name == 'print':
+        token = _check_print(expr=expr)
+        if token is not None:
+            yield token
         return
 
-    # random, import,
-    if name == '__import__':
-        yield Token(marker='import')
-        return
-    if _is_random(expr=expr, name=name):
-        yield Token(marker='random', value=name)
-        return
-    if _is_syscall(expr=expr, name=name):
-        yield Token(marker='syscall', value=name)
-        return
-    if _is_time(expr=expr, name=name):
-        yield Token(marker='time', value=name)
-        return
+    # sys.stdout, random.*, os.exec*, etc.
+    root, _, _ = name.partition('.')
+    classify = _ROOT_DISPATCH.get(root)
+    if classify is not None:
+        token = classify(expr=expr, name=name)
+        if token is not None:
+            yield token
+            return
 
     # read and write
     if name == 'open':
         if _is_open_to_write(expr):
-            yield Token(marker='write', value='open')
+            yield Token(marker='write', value='open', line=line, col=col)
         else:
-            yield Token(marker='read', value='open')
+            yield Token(marker='read', value='open', line=line, col=col)
         return
-    if _is_pathlib_write(expr):
-        yield Token(marker='write', value='Path.open')
+    if name.endswith(PATHLIB_WRITE_SUFFIXES) and _is_pathlib_write(expr):
+        yield Token(marker='write', value='Path.open', line=line, col=col)
         return
 
     yield from _infer_markers(expr=expr, dive=dive, stubs=stubs)
@@ -190,7 +283,7 @@ def _infer_markers(expr, dive: bool, stubs: StubsManager | None = None) -> Itera
 
 def _markers_from_inferred(expr: astroid.NodeNG, inferred: tuple) -> Iterator[Token]:
     for node in inferred:
-        module, full_name = get_full_name(node)
+        module, full_name = _get_full_name(node)
         qual_name = f'{module}.{full_name}'
         if qual_name in NETWORK_FUNCS:
             yield Token(
@@ -200,7 +293,7 @@ def _markers_from_inferred(expr: astroid.NodeNG, inferred: tuple) -> Iterator[To
                 col=expr.col_offset,
             )
             return
-        if isinstance(node, astroid.BoundMethod):
+        if isinstance(node, astroid.BoundMethod) and node.name in MAYBE_RANDOM_FUNCS:
             if node.bound.pytype() == 'random.Random':
                 yield Token(
                     marker='random',
@@ -211,40 +304,60 @@ def _markers_from_inferred(expr: astroid.NodeNG, inferred: tuple) -> Iterator[To
                 return
 
 
+def _get_name(expr) -> str | None:
+    return memoize(_NAME_CACHE, get_name, expr)
+
+
+def _get_full_name(expr) -> tuple[str, str]:
+    return memoize(_FULL_NAME_CACHE, get_full_name, expr)
+
+
 def _is_open_to_write(expr) -> bool:
-    for arg in expr.args:
-        if astroid is not None:  # pragma: no-astroid
-            if isinstance(arg, astroid.Const) and arg.value == 'w':
-                return True
-        if isinstance(arg, ast.Str) and 'w' in arg.s:
-            return True
+    return memoize(_OPEN_TO_WRITE_CACHE, _check_open_to_write, expr)
 
-    if not expr.keywords:
-        return False
-    for arg in expr.keywords:
-        if arg.arg != 'mode':
-            continue
-        if astroid is not None:  # pragma: no-astroid
-            if isinstance(arg.value, astroid.Const) and 'w' in arg.value.value:
-                return True
-        if isinstance(arg.value, ast.Str) and 'w' in arg.value.s:
-            return True
+
+def _check_open_to_write(expr, mode_pos: int = 1) -> bool:
+    """Check if the file is opened in the write mode.
+
+    The mode can be passed as a positional argument on the `mode_pos` position
+    (1 for `open` and 0 for `Path.open`) or as the `mode` keyword argument.
+    The constant value is `ast.Constant.value`, `ast.Str.s`, or `astroid.Const.value`.
+    """
+    args = expr.args
+    if len(args) > mode_pos:
+        mode = _get_str_value(args[mode_pos])
+        return mode is not None and 'w' in mode
+    for arg in (expr.keywords or ()):
+        if arg.arg == 'mode':
+            mode = _get_str_value(arg.value)
+            return mode is not None and 'w' in mode
     return False
 
 
+def _get_str_value(expr) -> str | None:
+    value = getattr(expr, 'value', None)
+    if value is None:
+        value = getattr(expr, 's', None)
+    if isinstance(value, str):
+        return value
+    return None
+
+
 def _is_pathlib_write(expr) -> bool:
+    return memoize(_PATHLIB_WRITE_CACHE, _check_pathlib_write, expr)
+
+
+def _check_pathlib_write(expr) -> bool:
+    # `handle_call` checks the method name before calling it
+    # (`PATHLIB_WRITE_SUFFIXES`), so here only the node types are checked.
     if astroid is None:  # pragma: no-astroid
         return False
-    if not isinstance(expr, astroid.Call):
-        return False
-    if not isinstance(expr.func, astroid.Attribute):
-        return False
-    if expr.func.attrname not in ('write_text', 'write_bytes', 'open'):
+    if not isinstance(expr, astroid.Call) or not isinstance(expr.func, astroid.Attribute):
         return False
 
     # if it's open, check that mode is "w"
     if expr.func.attrname == 'open':
-        if not _is_open_to_write(expr):
+        if not _check_open_to_write(expr, mode_pos=0):
             return False
 
     for value in infer(expr.func.expr):
@@ -260,7 +373,7 @@ def _markers_from_stubs(expr: astroid.Call, inferred, stubs: StubsManager) -> It
     for value in inferred:
         if type(value) is not astroid.FunctionDef:
             continue
-        module_name, func_name = get_full_name(expr=value)
+        module_name, func_name = _get_full_name(value)
         stub = get_stub(module_name=module_name, expr=value, stubs=stubs)
         if stub is None:
             continue
@@ -276,8 +389,14 @@ def _markers_from_func(expr: astroid.NodeNG, inferred: tuple) -> Iterator[Token]
         if not isinstance(value, (astroid.FunctionDef, astroid.UnboundMethod)):
             continue
 
-        # recursively infer markers from the function body
+        # recursively infer markers from the function body.
+        # All tokens point to the same call, so duplicates are dropped.
+        seen = set()
         for token in get_markers(body=value.body, dive=False):
+            key = (token.marker, token.value)
+            if key in seen:
+                continue
+            seen.add(key)
             yield Token(
                 marker=token.marker,
                 value=token.value,
@@ -293,68 +412,62 @@ def _markers_from_func(expr: astroid.NodeNG, inferred: tuple) -> Iterator[Token]
                 value = get_value(arg)
                 if type(value) is not str:
                     continue
-                yield Token(marker=value, line=expr.lineno, col=expr.col_offset)
+                yield Token(marker=sys.intern(value), line=expr.lineno, col=expr.col_offset)
     return None
 
 
-def _check_print(expr, name: str) -> Token | None:
-    """Return token if expr is `print` function call.
+def _check_print(expr) -> Token | None:
+    """Return token for the given `print` function call.
 
     Marker type depends on `file=` keyword argument.
     If it is missed, the type is `stdout`.
     If it is `stdout` or `stderr`, the type is `stdout` or `stderr`.
     Otherwise, there is no marker. It writes something into a stream, and it's ok.
     """
-    if name != 'print':
-        return None
+    line = expr.lineno
+    col = expr.col_offset
     for kwarg in (expr.keywords or []):
         if kwarg.arg != 'file':
             continue
-        value = get_name(expr=kwarg.value)
+        value = _get_name(kwarg.value)
         if value in ('stdout', 'sys.stdout'):
-            return Token(
-                marker='stdout',
-                value='print',
-                line=expr.lineno,
-                col=expr.col_offset,
-            )
+            return Token(marker='stdout', value='print', line=line, col=col)
         if value in ('stderr', 'sys.stderr'):
-            return Token(
-                marker='stderr',
-                value='print',
-                line=expr.lineno,
-                col=expr.col_offset,
-            )
+            return Token(marker='stderr', value='print', line=line, col=col)
         return None
-    return Token(
-        marker='stdout',
-        value='print',
-        line=expr.lineno,
-        col=expr.col_offset,
-    )
+    return Token(marker='stdout', value='print', line=line, col=col)
+
+
+def _classify_sys(expr, name: str) -> Token | None:
+    _, _, attr = name.partition('.')
+    stream, _, _ = attr.partition('.')
+    if stream in ('stdout', 'stderr', 'stdin'):
+        return Token(
+            marker=stream,
+            value=f'sys.{stream}.',
+            line=expr.lineno,
+            col=expr.col_offset,
+        )
+    return None
 
 
-def _is_random(expr, name: str) -> bool:
-    if name.startswith('random.'):
-        return True
+def _classify_random(expr, name: str) -> Token | None:
     if '.' in name:
-        return False
-    if name in DEFINITELY_RANDOM_FUNCS:
-        return True
-    return False
+        return Token(marker='random', value=name, line=expr.lineno, col=expr.col_offset)
+    return None
 
 
-def _is_syscall(expr, name: str) -> bool:
-    if name in SYSCALLS:
-        return True
-    if name.startswith(SYSCALLS_PREFIXES):
-        return True
-    return False
+def _classify_os(expr, name: str) -> Token | None:
+    # the root is already known to be `os`, check only the rest of the name
+    if name[3:].startswith(OS_SYSCALLS_PREFIXES):
+        return Token(marker='syscall', value=name, line=expr.lineno, col=expr.col_offset)
+    return None
 
 
-def _is_time(expr, name: str) -> bool:
-    if name in TIMES:
-        return True
-    if f'time.{name}' in TIMES:
-        return True
-    return False
+# Classifiers for names that need more than an exact match,
+# dispatched by the first component of the dotted name.
+_ROOT_DISPATCH: dict[str, Callable[..., Token | None]] = {
+    'sys': _classify_sys,
+    'random': _classify_random,
+    'os': _classify_os,
+}
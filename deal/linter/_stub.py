@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 from typing import Any, Iterator, NamedTuple, Sequence
 
@@ -11,6 +12,10 @@ try:
     import astroid
 except ImportError:
     astroid = None
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 EXTENSION = '.json'
@@ -19,23 +24,35 @@ CPYTHON_ROOT = ROOT / 'cpython'
 
 
 class StubFile:
-    __slots__ = ('path', '_content')
+    __slots__ = ('path', '_content', '_frozen')
     path: Path
     _content: dict[str, dict[str, Any]]
+    _frozen: dict[tuple[str, str], frozenset[str]]
 
     def __init__(self, path: Path) -> None:
         self.path = path
         self._content = dict()
+        self._frozen = dict()
 
     def load(self) -> None:
-        with self.path.open(encoding='utf8') as stream:
-            self._content = json.load(stream)
+        content = self.path.read_bytes()
+        if orjson is not None:
+            self._content = orjson.loads(content)
+        else:
+            self._content = json.loads(content)
+        self._frozen.clear()
 
     def dump(self) -> None:
         if not self._content:
             return
-        with self.path.open(mode='w', encoding='utf8') as stream:
-            json.dump(obj=self._content, fp=stream, indent=2, sort_keys=True)
+        if orjson is not None:
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+            content = orjson.dumps(self._content, option=options)
+        else:
+            # non-ASCII is written as is, the same as orjson does
+            raw = json.dumps(self._content, indent=2, sort_keys=True, ensure_ascii=False)
+            content = raw.encode('utf8')
+        self.path.write_bytes(content)
 
     def add(self, func: str, contract: Category, value: str) -> None:
         if contract not in (Category.RAISES, Category.HAS):
@@ -46,23 +63,34 @@ class StubFile:
             return
         values.append(value)
         values.sort()
+        self._frozen.pop((func, contract.value), None)
 
     def get(self, func: str, contract: Category) -> frozenset[str]:
         if contract not in (Category.RAISES, Category.HAS):
             raise ValueError('unsupported contract')
-        values = self._content.get(func, {}).get(contract.value, [])
-        return frozenset(values)
+        key = (func, contract.value)
+        cached = self._frozen.get(key)
+        if cached is not None:
+            return cached
+        # Values are interned to be the same objects as marker names
+        # in the linter code, so `==` and `in` checks on them succeed
+        # on the identity shortcut of the string comparison.
+        values = frozenset(map(sys.intern, self._content.get(func, {}).get(contract.value, [])))
+        self._frozen[key] = values
+        return values
 
 
 class StubsManager:
-    __slots__ = ('paths', '_modules')
+    __slots__ = ('paths', '_modules', '_pkg_dirs')
     _modules: dict[str, StubFile]
+    _pkg_dirs: dict[Path, bool]
     paths: tuple[Path, ...]
 
     default_paths = (ROOT, CPYTHON_ROOT)
 
     def __init__(self, paths: Sequence[Path] | None = None) -> None:
         self._modules = dict()
+        self._pkg_dirs = dict()
         if paths is None:
             self.paths = self.default_paths
         else:
@@ -74,7 +102,7 @@ class StubsManager:
         if path.suffix != EXTENSION:
             raise ValueError(f'invalid stub file extension: *{path.suffix}')
         if module_name is None:
-            module_name = self._get_module_name(path=path)
+            module_name = self._get_module_name(path=path, pkg_dirs=self._pkg_dirs)
         if module_name not in self._modules:
             stub = StubFile(path=path)
             stub.load()
@@ -82,13 +110,20 @@ class StubsManager:
         return self._modules[module_name]
 
     @staticmethod
-    def _get_module_name(path: Path) -> str:
+    def _get_module_name(path: Path, pkg_dirs: dict[Path, bool] | None = None) -> str:
+        """Get the full module name for the given path.
+
+        The `pkg_dirs` cache, if passed, is used to remember which directories
+        are Python packages, so the same tree isn't probed again and again.
+        """
+        if pkg_dirs is None:
+            pkg_dirs = dict()
         path = path.resolve()
         # walk up by the tree as pytest does
-        if not (path.parent / '__init__.py').exists():
+        if not _is_package(path.parent, pkg_dirs):
             return path.stem
         for parent in path.parents:
-            if not (parent / '__init__.py').exists():
+            if not _is_package(parent, pkg_dirs):
                 parts = path.relative_to(parent).with_suffix('').parts
                 return '.'.join(parts)
         raise RuntimeError('unreachable: __init__.py files up to root?')  # pragma: no cover
@@ -111,7 +146,7 @@ class StubsManager:
     def create(self, path: Path) -> StubFile:
         if path.suffix == '.py':
             path = path.with_suffix(EXTENSION)
-        module_name = self._get_module_name(path=path)
+        module_name = self._get_module_name(path=path, pkg_dirs=self._pkg_dirs)
 
         # if the stub for file is somewhere in the paths, use this instead.
         stub = self.get(module_name=module_name)
@@ -126,6 +161,14 @@ class StubsManager:
         return stub
 
 
+def _is_package(path: Path, pkg_dirs: dict[Path, bool]) -> bool:
+    is_package = pkg_dirs.get(path)
+    if is_package is None:
+        is_package = (path / '__init__.py').exists()
+        pkg_dirs[path] = is_package
+    return is_package
+
+
 class PseudoFunc(NamedTuple):
     name: str
     body: list
@@ -156,7 +199,9 @@ def _get_funcs_from_expr(expr: astroid.NodeNG, prefix: str = '') -> Iterator[Pse
 
 
 def generate_stub(*, path: Path, stubs: StubsManager | None = None) -> Path:
-    from ._extractors import get_exceptions, get_markers
+    from ._extractors import (
+        clear_infer_cache, clear_markers_cache, get_exceptions, get_markers,
+    )
 
     if path.suffix != '.py':
         raise ValueError(f'invalid Python file extension: *{path.suffix}')
@@ -164,14 +209,25 @@ def generate_stub(*, path: Path, stubs: StubsManager | None = None) -> Path:
     if stubs is None:
         stubs = StubsManager()
     stub = stubs.create(path=path)
-    for func in _get_funcs(path=path):
-        for token in get_exceptions(body=func.body, stubs=stubs):
-            value = token.value
-            if isinstance(value, type):
-                value = value.__name__
-            stub.add(func=func.name, contract=Category.RAISES, value=str(value))
-        for token in get_markers(body=func.body, stubs=stubs):
-            assert token.marker is not None
-            stub.add(func=func.name, contract=Category.HAS, value=token.marker)
+    try:
+        for func in _get_funcs(path=path):
+            # collect unique values first, `StubFile.add` sorts values on each call
+            excs = set()
+            for token in get_exceptions(body=func.body, stubs=stubs):
+                value = token.value
+                if isinstance(value, type):
+                    value = value.__name__
+                excs.add(str(value))
+            markers = set()
+            for token in get_markers(body=func.body, stubs=stubs):
+                assert token.marker is not None
+                markers.add(token.marker)
+            for value in sorted(excs):
+                stub.add(func=func.name, contract=Category.RAISES, value=value)
+            for value in sorted(markers):
+                stub.add(func=func.name, contract=Category.HAS, value=value)
+    finally:
+        clear_markers_cache()
+        clear_infer_cache()
     stub.dump()
     return stub.path
@@ -49,6 +49,24 @@ def test_stdin():
     assert errors == EXPECTED
 
 
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_caches_cleared_on_partial_iteration(tmp_path: Path):
+    from deal.linter._extractors.common import _INFER_CACHE
+    from deal.linter._extractors.markers import _NAME_CACHE
+
+    path = tmp_path / 'test.py'
+    path.write_text(TEXT)
+    checker = Checker.from_path(path)
+    errors = checker.get_errors()
+    # stop in the middle of the `raises` rule, after it inferred something
+    next(errors)
+    next(errors)
+    assert _INFER_CACHE
+    errors.close()
+    assert not _NAME_CACHE
+    assert not _INFER_CACHE
+
+
 def test_astroid_path(tmp_path: Path):
     path = tmp_path / 'test.py'
     path.write_text(TEXT)
@@ -2,7 +2,10 @@ import ast
 
 import pytest
 
-from deal.linter._extractors.common import _get_module, get_full_name, get_name, infer
+from deal.linter._extractors.common import (
+    _INFER_CACHE, DEFAULT_COL, DEFAULT_LINE, Extractor, Token,
+    _get_module, clear_infer_cache, get_full_name, get_name, infer,
+)
 
 
 try:
@@ -49,6 +52,31 @@ def test_infer(text, expected):
     assert [get_full_name(e) for e in actual] == expected
 
 
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_infer_is_cached():
+    tree = astroid.parse('def f(): pass\nf')
+    expr = tree.body[-1].value
+    actual = infer(expr=expr)
+    assert infer(expr=expr) is actual
+    clear_infer_cache()
+    assert not _INFER_CACHE
+    assert infer(expr=expr) is not actual
+
+
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_infer_does_not_cache_failures(monkeypatch):
+    tree = astroid.parse('def f(): pass\nf')
+    expr = tree.body[-1].value
+
+    def fail(*args, **kwargs):
+        raise RecursionError
+
+    monkeypatch.setattr(expr, 'infer', fail)
+    assert infer(expr=expr) == ()
+    monkeypatch.undo()
+    assert [get_full_name(e) for e in infer(expr=expr)] == [('', 'f')]
+
+
 @pytest.mark.skipif(astroid is None, reason='astroid is not installed')
 def test_get_full_name_func():
     tree = astroid.parse('def f(): pass')
@@ -105,3 +133,17 @@ def test_get_module():
 
     tree.body[0].parent = None
     assert _get_module(expr=tree.body[0]) is None
+
+
+@pytest.mark.parametrize('line, col, expected', [
+    (DEFAULT_LINE, DEFAULT_COL, (3, 4)),
+    (7, DEFAULT_COL, (7, 4)),
+    (DEFAULT_LINE, 5, (3, 5)),
+    (7, 5, (7, 5)),
+])
+def test_ensure_node_info(line, col, expected):
+    expr = ast.parse('\nif 1:\n    a').body[0].body[0]
+    token = Token(line=line, col=col, value='v', marker='m')
+    result = Extractor._ensure_node_info(token=token, expr=expr)
+    assert (result.line, result.col) == expected
+    assert (result.value, result.marker) == ('v', 'm')
@@ -3,7 +3,8 @@ from textwrap import dedent
 
 import pytest
 
-from deal.linter._extractors import get_markers
+from deal.linter._extractors import clear_markers_cache, get_markers
+from deal.linter._extractors.markers import _PATHLIB_WRITE_CACHE
 from deal.linter._stub import StubsManager
 
 
@@ -22,13 +23,16 @@ except ImportError:
 
     ('import sys\nsys.stdout.write(1)', ('stdout', )),
     ('import sys\nsys.stderr.write(1)', ('stderr', )),
+    ('import sys\nsys.exit(1)', ()),
 
     ('open("fpath", "w")', ('write', )),
     ('open("fpath", mode="w")', ('write', )),
     ('with open("fpath", "w") as f: ...', ('write', )),
+    ('p.open("w")', ()),             # not pathlib, `p` is unknown
 
     ('with something: ...', ()),     # uninferrable `with` test
     ('something().anything()', ()),  # complex call, cannot get name
+    ('len([1, 2])', ()),             # builtin without markers
 
     ('with open("fpath") as f: ...', ('read', )),
     ('with open("fpath", "r") as f: ...', ('read', )),
@@ -36,6 +40,8 @@ except ImportError:
     ('open("fpath", "r")', ('read', )),
     ('open("fpath")', ('read', )),
     ('open("fpath", encoding="utf8")', ('read', )),
+    ('open("write.txt")', ('read', )),
+    ('open("fpath", "wb")', ('write', )),
 
     ('input()', ('stdin', )),
     ('input("say hi: ")', ('stdin', )),
@@ -46,9 +52,12 @@ except ImportError:
     ('random.randrange(10)', ('random', )),
     ('random.random(10)', ('random', )),
     ('randrange(10)', ('random', )),
+    ('random()', ()),
 
     ('os.system("echo")', ('syscall', )),
     ('os.execvp("echo", ["hi"])', ('syscall', )),
+    ('os.popen("echo")', ('syscall', )),
+    ('os.path.join("a", "b")', ()),
     ('subprocess.run("echo")', ('syscall', )),
     ('subprocess.call("echo")', ('syscall', )),
     ('subprocess.call(["echo"])', ('syscall', )),
@@ -105,9 +114,12 @@ def test_io_infer(text, expected):
 @pytest.mark.skipif(astroid is None, reason='astroid is not installed')
 @pytest.mark.parametrize('text, expected', [
     ('from random import choice \nchoice([1,2])', ('random', )),
+    ('from random import gauss \ngauss(0, 1)', ('random', )),
+    ('from random import getstate \ngetstate()', ()),
     ('choice([1,2])', ()),
     ('choice = lambda:0 \nchoice()', ()),
     ('class A:\n def b(self): pass \nchoice = A().b \nchoice()', ()),
+    ('class A:\n def choice(self): pass \na = A() \na.choice()', ()),
 ])
 def test_other_infer(text, expected):
     tree = astroid.parse(text)
@@ -191,6 +203,46 @@ def test_io_recursive_analize_body():
     assert markers == ('stdout', )
 
 
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_io_recursive_no_duplicates():
+    text = """
+    def inner(text):
+        print(text)
+        print(text)
+        input()
+
+    def outer():
+        inner('hello')
+    """
+    text = dedent(text)
+    tree = astroid.parse(text)
+    tokens = list(get_markers(body=tree.body[-1].body))
+    markers = tuple(t.marker for t in tokens)
+    assert markers == ('stdout', 'stdin')
+
+
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+@pytest.mark.parametrize('call', [
+    '_sr.choice([1, 2])',
+    '_sr.shuffle([1, 2])',
+    '_sr.sample([1, 2], 1)',
+])
+def test_io_recursive_system_random(call):
+    text = f"""
+    import random
+
+    _sr = random.SystemRandom()
+
+    def f():
+        return {call}
+    """
+    text = dedent(text)
+    tree = astroid.parse(text)
+    tokens = list(get_markers(body=tree.body[-1].body))
+    markers = tuple(t.marker for t in tokens)
+    assert 'random' in markers
+
+
 @pytest.mark.skipif(astroid is None, reason='astroid is not installed')
 def test_io_recursive_explicit_markers():
     text = """
@@ -234,3 +286,17 @@ def test_markers_from_stubs():
     tokens = list(get_markers(body=tree.body[-1].body, stubs=stubs))
     markers = tuple(t.marker for t in tokens)
     assert markers == ('import', )
+
+
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_pathlib_write_is_cached():
+    text = 'from pathlib import Path\np = Path()\np.write_text("lol")'
+    tree = astroid.parse(text)
+    clear_markers_cache()
+    for _ in range(2):
+        tokens = list(get_markers(body=tree.body))
+        markers = tuple(t.marker for t in tokens if t.marker != 'import')
+        assert markers == ('write', )
+    assert len(_PATHLIB_WRITE_CACHE) == 1
+    clear_markers_cache()
+    assert not _PATHLIB_WRITE_CACHE
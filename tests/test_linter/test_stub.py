@@ -94,6 +94,59 @@ def test_stub_file(tmp_path: Path):
     assert stub2._content == {'fname': {'raises': ['TypeError']}}
 
 
+def test_stub_file_get_cache(tmp_path: Path):
+    path = tmp_path / 'example.json'
+    path.write_text(json.dumps({'fname': {'raises': ['KeyError']}}))
+    stub = StubFile(path=path)
+    stub.add(func='fname', contract=Category.RAISES, value='TypeError')
+
+    # get is cached
+    values = stub.get(func='fname', contract=Category.RAISES)
+    assert values == {'TypeError'}
+    assert stub.get(func='fname', contract=Category.RAISES) is values
+
+    # add invalidates the cache
+    stub.add(func='fname', contract=Category.RAISES, value='ValueError')
+    assert stub.get(func='fname', contract=Category.RAISES) == {'TypeError', 'ValueError'}
+
+    # load invalidates the cache
+    stub.load()
+    assert stub.get(func='fname', contract=Category.RAISES) == {'KeyError'}
+
+
+def test_stub_file_without_orjson(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr('deal.linter._stub.orjson', None)
+    path = tmp_path / 'example.json'
+    stub = StubFile(path=path)
+    stub.add(func='fname', contract=Category.RAISES, value='TypeError')
+    stub.dump()
+    assert json.loads(path.read_text()) == {'fname': {'raises': ['TypeError']}}
+
+    stub2 = StubFile(path=path)
+    stub2.load()
+    assert stub2._content == {'fname': {'raises': ['TypeError']}}
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+@pytest.mark.parametrize('content', [
+    {'g': {'raises': ['ValueError']}, 'f': {'has': ['io'], 'raises': ['TypeError']}},
+    {'fünc': {'raises': ['ÄError']}},
+])
+def test_stub_file_dump_format(tmp_path: Path, monkeypatch, content, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr('deal.linter._stub.orjson', None)
+    path = tmp_path / 'example.json'
+    stub = StubFile(path=path)
+    stub._content = content
+    stub.dump()
+    expected = json.dumps(content, indent=2, sort_keys=True, ensure_ascii=False)
+    assert path.read_text(encoding='utf8') == expected
+
+    stub2 = StubFile(path=path)
+    stub2.load()
+    assert stub2._content == content
+
+
 @pytest.mark.parametrize('given, expected', [
     ('def f(): pass', ['f']),
     ('async def f(): pass', ['f']),
@@ -122,6 +175,23 @@ def test_get_module_name(tmp_path: Path):
     assert StubsManager._get_module_name(path=path) == 'project.example'
 
 
+@pytest.mark.skipif(astroid is None, reason='astroid is not installed')
+def test_get_module_name_caches_packages(tmp_path: Path):
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / '__init__.py').touch()
+    path = root / 'example.py'
+    path.touch()
+    pkg_dirs: dict = {}
+    assert StubsManager._get_module_name(path=path, pkg_dirs=pkg_dirs) == 'project.example'
+    assert pkg_dirs[root.resolve()] is True
+    assert pkg_dirs[tmp_path.resolve()] is False
+
+    # the cached result is used even if the tree has changed
+    (tmp_path / '__init__.py').touch()
+    assert StubsManager._get_module_name(path=path, pkg_dirs=pkg_dirs) == 'project.example'
+
+
 @pytest.mark.parametrize('given, expected', [
     ('deal.linter', 'deal.linter.__init__'),
     ('deal._state', 'deal._state'),